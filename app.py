@@ -172,6 +172,8 @@ def main():
                     if result['success']:
                         st.session_state.processed_data = result['data']
                         st.session_state.processing_stats = result.get('stats', {})
+                        # Per-table counts shared by the Excel export and the HTML report
+                        st.session_state.table_summary = ReportGenerator().summarize_tables(result['data'])
                         st.session_state.fuzzy_algorithm = fuzzy_algorithm
                         st.session_state.fuzzy_threshold = fuzzy_threshold
                         st.session_state.table_file_provided = table_file is not None
@@ -193,6 +195,7 @@ def main():
         
         # Get processing statistics
         stats = st.session_state.get('processing_stats', {})
+        table_summary = st.session_state.get('table_summary')
         
         # Display main statistics
         col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
@@ -269,7 +272,7 @@ def main():
         st.subheader("📋 Processed Data")
         
         # Show all original columns from the source file including table_name, attr_name, business_name, attr_description
-        original_columns_only = processed_df[[col for col in processed_df.columns if col != 'matched']]
+        original_columns_only = processed_df.drop(columns=['matched'], errors='ignore')
         
         # Show column preservation info
         original_col_count = len(original_columns_only.columns)
@@ -325,7 +328,7 @@ def main():
                 if st.button("📊 Export Single Excel File", type="primary"):
                     with st.spinner("Creating Excel file with all processed data..."):
                         report_gen = ReportGenerator()
-                        excel_data = report_gen.create_excel_export(processed_df, stats)
+                        excel_data = report_gen.create_excel_export(processed_df, stats, table_summary=table_summary)
                         st.session_state.single_excel_data = excel_data
                     
                     original_cols = len([col for col in processed_df.columns if col != 'matched'])
@@ -365,7 +368,8 @@ def main():
                             processed_df, 
                             stats, 
                             fuzzy_alg, 
-                            fuzzy_thresh
+                            fuzzy_thresh,
+                            table_summary=table_summary
                         )
                         
                         st.session_state.html_report = html_report
@@ -378,7 +382,7 @@ def main():
             with download_col1:
                 # Create comprehensive Excel file for download
                 report_gen = ReportGenerator()
-                excel_data = report_gen.create_excel_export(processed_df, stats)
+                excel_data = report_gen.create_excel_export(processed_df, stats, table_summary=table_summary)
                 
                 st.download_button(
                     label="📥 Download Excel Report",
@@ -412,7 +416,8 @@ def main():
                             processed_df, 
                             stats, 
                             fuzzy_alg, 
-                            fuzzy_thresh
+                            fuzzy_thresh,
+                            table_summary=table_summary
                         )
                         
                         st.session_state.html_report = html_report
@@ -443,6 +448,7 @@ def main():
             st.session_state.processed_data = None
             st.session_state.processing_complete = False
             st.session_state.processing_stats = None
+            st.session_state.table_summary = None
             if 'html_report' in st.session_state:
                 del st.session_state.html_report
             st.rerun()
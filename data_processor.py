@@ -1,5 +1,5 @@
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from fuzzywuzzy import fuzz
 
 class DataProcessor:
@@ -7,6 +7,18 @@ class DataProcessor:
     Handles the processing of Excel files to extract demographic data
     """
     
+    # Terms that appear in most demographic descriptions
+    _COMMON_TERMS = ("address", "phone", "email", "name")
+    
+    # Supported fuzzy matching algorithms, shared with the report's algorithm examples;
+    # each caller picks its own fallback for unknown names (fuzz.ratio here)
+    FUZZY_SCORERS = {
+        "ratio": fuzz.ratio,
+        "partial_ratio": fuzz.partial_ratio,
+        "token_sort_ratio": fuzz.token_sort_ratio,
+        "token_set_ratio": fuzz.token_set_ratio
+    }
+    
     def __init__(self, demographic_keywords: List[str] = None,
                  fuzzy_algorithm: str = "ratio", fuzzy_threshold: int = 80):
         """
@@ -50,6 +62,27 @@ class DataProcessor:
             "customer since", "account opened"
         ]
         
+        # Combined, de-duplicated keyword tuple used by the matching loops. Keywords
+        # containing the most common demographic terms are tried first, longest first,
+        # so positive rows hit a match after as few scorer calls as possible.
+        self._all_keywords_lower = tuple(sorted(
+            dict.fromkeys(self.demographic_data_types + self.demographic_keywords),
+            key=lambda keyword: (not any(term in keyword for term in self._COMMON_TERMS), -len(keyword))
+        ))
+        
+        # Resolve the scorer once instead of dispatching on the algorithm name per keyword
+        self._fuzzy_func = self.FUZZY_SCORERS.get(fuzzy_algorithm, fuzz.ratio)
+        
+        # fuzz.ratio is 2*M/T with M bounded by the shorter string's length, so a pair
+        # can only reach the threshold if 400*min(len) >= (2*threshold - 1)*(total len);
+        # the -1 keeps pairs that could round up to the threshold. 0 disables the bound.
+        self._ratio_length_bound = 2 * fuzzy_threshold - 1 if self._fuzzy_func is fuzz.ratio and fuzzy_threshold > 0 else 0
+        
+        # Shortest and longest keyword, used to reject whole rows under the ratio bound
+        keyword_lengths = [len(keyword) for keyword in self._all_keywords_lower] or [0]
+        self._min_keyword_len = min(keyword_lengths)
+        self._max_keyword_len = max(keyword_lengths)
+        
     def process_files(self, table_file, columns_file) -> Dict[str, Any]:
         """
         Process the uploaded files and return demographic data
@@ -69,10 +102,10 @@ class DataProcessor:
             original_columns_total = len(columns_df)
             original_table_total = 0
             
-            # Read table file if provided
-            table_df = None
+            # Read table file if provided - only its row count is used, so parse just
+            # the first column
             if table_file is not None:
-                table_df = self._read_file(table_file, "table data")
+                table_df = self._read_file(table_file, "table data", usecols=[0])
                 original_table_total = len(table_df)
             
             # Extract demographic data from columns file
@@ -85,8 +118,9 @@ class DataProcessor:
             demographic_rows_extracted = len(demographic_data)
             non_demographic_rows = original_columns_total - demographic_rows_extracted
             
-            # Use demographic data as-is, preserving ALL original columns
-            merged_data = demographic_data.copy()
+            # Use demographic data as-is, preserving ALL original columns (it is already
+            # a standalone frame, so no further copy is needed)
+            merged_data = demographic_data
             # Only add the 'matched' metadata column - preserve original 'table_name' if it exists
             if 'matched' not in merged_data.columns:
                 merged_data['matched'] = True
@@ -111,22 +145,23 @@ class DataProcessor:
         except Exception as e:
             return {'success': False, 'error': f'Processing error: {str(e)}'}
     
-    def _read_file(self, file, file_type: str) -> pd.DataFrame:
+    def _read_file(self, file, file_type: str, usecols: Optional[List[Any]] = None) -> pd.DataFrame:
         """
         Read Excel or CSV file and handle potential errors
         
         Args:
             file: File object to read
             file_type: Description of file type for error messages
+            usecols: Optional subset of columns to parse (all columns when None)
             
         Returns:
             DataFrame containing the file data
         """
         try:
             if file.name.lower().endswith('.csv'):
-                return pd.read_csv(file)
+                return pd.read_csv(file, usecols=usecols)
             else:
-                return pd.read_excel(file)
+                return pd.read_excel(file, usecols=usecols)
         except Exception as e:
             raise Exception(f"Error reading {file_type}: {str(e)}")
     
@@ -146,7 +181,7 @@ class DataProcessor:
             
             if demographic_mask.any():
                 # Return rows where demographic content was found, keeping ALL columns
-                return columns_df[demographic_mask].copy()
+                return self._select_rows(columns_df, demographic_mask)
         
         # Fallback: identify demographic rows by checking all column content
         demographic_mask = pd.Series([False] * len(columns_df), index=columns_df.index)
@@ -156,17 +191,34 @@ class DataProcessor:
             for col in columns_df.columns:
                 cell_value = str(row[col])
                 if cell_value and cell_value.lower() != 'nan':
-                    if self._fuzzy_match_demographic(cell_value, self.demographic_data_types + self.demographic_keywords):
+                    if self._fuzzy_match_demographic(cell_value, self._all_keywords_lower):
                         demographic_mask[idx] = True
                         break
         
         if demographic_mask.any():
             # Return matching rows with ALL original columns preserved
-            return columns_df[demographic_mask].copy()
+            return self._select_rows(columns_df, demographic_mask)
         
         # If no demographic data found, return empty DataFrame
         return pd.DataFrame()
     
+    def _select_rows(self, df: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+        """
+        Select the rows flagged in a boolean mask as a standalone DataFrame
+        
+        take() builds the result in a single allocation and, unlike boolean
+        indexing, does not tie it to the source frame, so callers can add columns
+        without a defensive .copy()
+        
+        Args:
+            df: DataFrame to select from
+            mask: Boolean Series aligned with df
+            
+        Returns:
+            DataFrame containing only the flagged rows
+        """
+        return df.take(mask.to_numpy().nonzero()[0])
+    
     def _identify_demographic_columns(self, columns) -> List[str]:
         """
         Identify which columns contain demographic information based on keywords
@@ -179,15 +231,9 @@ class DataProcessor:
         """
         demographic_cols = []
         
-        # Combine predefined types with user-provided keywords
-        all_keywords = self.demographic_data_types + self.demographic_keywords
-        
         for col in columns:
-            col_lower = str(col).lower()
-            for keyword in all_keywords:
-                if self._fuzzy_match_demographic(col_lower, [keyword]):
-                    demographic_cols.append(col)
-                    break
+            if self._fuzzy_match_demographic(str(col), self._all_keywords_lower):
+                demographic_cols.append(col)
         
         return demographic_cols
     
@@ -202,49 +248,62 @@ class DataProcessor:
         Returns:
             Boolean Series indicating which rows contain demographic data
         """
-        # Combine predefined types with user-provided keywords
-        all_keywords = self.demographic_data_types + self.demographic_keywords
+        # Lowercase the whole description column once instead of once per keyword
+        descriptions_lower = columns_df[attr_desc_col].fillna('').astype(str).str.lower()
+        keywords = self._all_keywords_lower
         
         # Create boolean mask for demographic rows
-        demographic_mask = pd.Series([False] * len(columns_df), index=columns_df.index)
-        
-        for idx, row in columns_df.iterrows():
-            desc_text = str(row.get(attr_desc_col, ''))
-            if desc_text and desc_text.lower() != 'nan':
-                if self._fuzzy_match_demographic(desc_text, all_keywords):
-                    demographic_mask[idx] = True
+        matches = [
+            bool(desc_lower) and desc_lower != 'nan' and self._fuzzy_match_lowered(desc_lower, keywords)
+            for desc_lower in descriptions_lower
+        ]
         
-        return demographic_mask
+        return pd.Series(matches, index=columns_df.index, dtype=bool)
     
-    def _fuzzy_match_demographic(self, text: str, keywords: List[str]) -> bool:
+    def _fuzzy_match_demographic(self, text: str, keywords: Sequence[str]) -> bool:
         """
         Use fuzzy matching to determine if text contains demographic information
         
         Args:
             text: Text to analyze
-            keywords: List of demographic keywords to match against
+            keywords: Lowercase demographic keywords to match against
             
         Returns:
             Boolean indicating if text matches demographic criteria
         """
-        text_lower = text.lower()
+        return self._fuzzy_match_lowered(text.lower(), keywords)
+    
+    def _fuzzy_match_lowered(self, text_lower: str, keywords: Sequence[str]) -> bool:
+        """
+        Fuzzy match already-lowercased text against demographic keywords
         
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
+        Args:
+            text_lower: Lowercase text to analyze
+            keywords: Lowercase demographic keywords to match against
             
-            # Choose fuzzy matching algorithm
-            if self.fuzzy_algorithm == "ratio":
-                score = fuzz.ratio(text_lower, keyword_lower)
-            elif self.fuzzy_algorithm == "partial_ratio":
-                score = fuzz.partial_ratio(text_lower, keyword_lower)
-            elif self.fuzzy_algorithm == "token_sort_ratio":
-                score = fuzz.token_sort_ratio(text_lower, keyword_lower)
-            elif self.fuzzy_algorithm == "token_set_ratio":
-                score = fuzz.token_set_ratio(text_lower, keyword_lower)
-            else:
-                score = fuzz.ratio(text_lower, keyword_lower)
+        Returns:
+            Boolean indicating if text matches demographic criteria
+        """
+        fuzzy_func = self._fuzzy_func
+        fuzzy_threshold = self.fuzzy_threshold
+        length_bound = self._ratio_length_bound
+        text_len = len(text_lower)
+        
+        # Reject the whole row when even the keyword length closest to the text length
+        # cannot reach the threshold (the ratio bound peaks when the lengths are equal)
+        if length_bound and keywords is self._all_keywords_lower:
+            closest_len = min(max(text_len, self._min_keyword_len), self._max_keyword_len)
+            if 400 * min(text_len, closest_len) < length_bound * (text_len + closest_len):
+                return False
+        
+        for keyword_lower in keywords:
+            # Skip keywords whose length alone rules out a passing ratio score
+            if length_bound:
+                keyword_len = len(keyword_lower)
+                if 400 * min(text_len, keyword_len) < length_bound * (text_len + keyword_len):
+                    continue
             
-            if score >= self.fuzzy_threshold:
+            if fuzzy_func(text_lower, keyword_lower) >= fuzzy_threshold:
                 return True
         
         return False
@@ -267,14 +326,17 @@ class DataProcessor:
             # Get all columns excluding added processing columns
             original_columns = [col for col in merged_df.columns if col not in ['table_name', 'matched']]
         
+        # Sum the 'matched' flags once and derive the unmatched count from it
+        matched_records = merged_df['matched'].sum() if 'matched' in merged_df.columns else len(merged_df)
+        
         summary = {
             'total_records': len(merged_df),
             'original_columns': original_columns,
             'original_column_count': len(original_columns),
             'demographic_columns': original_columns,  # All original columns are preserved
             'demographic_column_count': len(original_columns),
-            'matched_records': merged_df['matched'].sum() if 'matched' in merged_df.columns else len(merged_df),
-            'unmatched_records': len(merged_df) - (merged_df['matched'].sum() if 'matched' in merged_df.columns else len(merged_df)),
+            'matched_records': matched_records,
+            'unmatched_records': len(merged_df) - matched_records,
             'processing_algorithm': self.fuzzy_algorithm,
             'processing_threshold': self.fuzzy_threshold
         }
@@ -0,0 +1,27 @@
+import pandas as pd
+
+# Excel writing helpers kept free of streamlit. Under the spawn or forkserver start
+# methods, worker processes of the multi-file export import only this, not the UI
+# framework; forked workers inherit whatever the parent has already imported.
+
+# Rows boxed to Python objects at a time when streaming a DataFrame into a worksheet
+_APPEND_BLOCK_ROWS = 10_000
+
+def append_dataframe_rows(ws, df: pd.DataFrame) -> None:
+    """
+    Stream a DataFrame into a write-only openpyxl worksheet, header row first
+    
+    Args:
+        ws: Worksheet created by a write-only openpyxl Workbook
+        df: DataFrame to write (the index is not written)
+    """
+    ws.append(list(df.columns))
+    
+    # Box one fixed-size block of rows at a time so peak memory stays bounded by the block,
+    # not the frame; Excel has no NaN/NaT, so they become empty cells as with to_excel
+    for start in range(0, len(df), _APPEND_BLOCK_ROWS):
+        block = df.iloc[start:start + _APPEND_BLOCK_ROWS].to_numpy(dtype=object, copy=True)
+        block[pd.isna(block)] = None
+        
+        for row in block:
+            ws.append(row.tolist())
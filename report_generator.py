@@ -1,28 +1,37 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.offline as pyo
 from datetime import datetime
-from jinja2 import Template
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache, Template
+from fuzzywuzzy import fuzz, process
+from openpyxl import Workbook
+from pandas.io.formats.format import format_array
 import base64
+import html
 import io
-from typing import Dict, Any, List
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from data_processor import DataProcessor
+from excel_utils import append_dataframe_rows
 
-class ReportGenerator:
-    """
-    Generates comprehensive HTML analysis reports with charts and tables
-    """
-    
-    def __init__(self):
-        self.report_template = """
+# Timestamp format shown in the report header and footer
+REPORT_DATE_FORMAT = "%B %d, %Y at %I:%M %p"
+
+REPORT_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Demographic Data Analysis Report</title>
+    {% if plotlyjs %}
+    <script>{{ plotlyjs }}</script>
+    {% else %}
     <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    {% endif %}
     <style>
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -175,7 +184,7 @@ class ReportGenerator:
                 </div>
                 <div class="metric-card">
                     <h3>Unique Tables</h3>
-                    <div class="value">{{ stats.unique_tables }}</div>
+                    <div class="value">{{ unique_tables }}</div>
                 </div>
                 <div class="metric-card">
                     <h3>Match Rate</h3>
@@ -189,7 +198,7 @@ class ReportGenerator:
                     <li>Processed {{ stats.original_columns_total }} total rows from input data</li>
                     <li>Successfully extracted {{ stats.demographic_rows_extracted }} demographic records ({{ stats.extraction_percentage }}% extraction rate)</li>
                     <li>{{ stats.matched_records }} records successfully matched with table information</li>
-                    <li>Data spans across {{ stats.unique_tables }} unique tables</li>
+                    <li>Data spans across {{ unique_tables }} unique tables</li>
                     <li>Overall match rate of {{ match_rate }}% achieved</li>
                 </ul>
             </div>
@@ -312,10 +321,160 @@ class ReportGenerator:
     </div>
 </body>
 </html>
+"""
+
+# Autoescaped, since the examples quote description text straight from the uploaded file
+ALGORITHM_DETAILS_TEMPLATE = """
+{% autoescape true %}
+<div class="algorithm-info" style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
+    <h3>Fuzzy Matching Algorithm: {{ algorithm_title }}</h3>
+
+    <div class="algorithm-description">
+        <h4>How It Works:</h4>
+        <p><strong>Algorithm:</strong> {{ algorithm_desc }}</p>
+        <p><strong>Threshold:</strong> {{ fuzzy_threshold }}% (minimum similarity required for a match)</p>
+        <p><strong>Process:</strong> The system analyzes the 'attr_description' column content and compares it against demographic keywords using fuzzy string matching. Any description with a similarity score above {{ fuzzy_threshold }}% is classified as demographic data.</p>
+    </div>
+
+    <div class="keywords-list">
+        <h4>Demographic Keywords Used:</h4>
+        <p style="font-style: italic;">age, gender, race, ethnicity, sex, birth, demographic, population, ancestry, nationality, heritage, origin, background</p>
+    </div>
+
+    {% if examples is not none %}
+    <h4>Matching Examples from Your Data:</h4>
+    <div class="examples-container">
+        {% for ex in examples %}
+        {% set color = "#28a745" if ex.match else "#dc3545" %}
+        <div class="example-item" style="border-left: 4px solid {{ color }}; padding: 10px; margin: 10px 0; background: #f8f9fa;">
+            <strong>Text:</strong> "{{ ex.text[:80] }}..."<br>
+            <strong>Best Keyword Match:</strong> "{{ ex.keyword }}"<br>
+            <strong>Similarity Score:</strong> {{ ex.score }}% <span style="color: {{ color }}; font-weight: bold;">({{ "✓ MATCH" if ex.match else "✗ NO MATCH" }})</span>
+        </div>
+        {% endfor %}
+    </div>
+    {% endif %}
+
+    <div class="algorithm-benefits">
+        <h4>Why Fuzzy Matching?</h4>
+        <ul>
+            <li><strong>Handles Typos:</strong> Finds matches even with spelling errors</li>
+            <li><strong>Flexible Matching:</strong> Works with partial words and different formats</li>
+            <li><strong>Configurable Precision:</strong> Adjustable threshold allows fine-tuning sensitivity</li>
+            <li><strong>Context Aware:</strong> Considers word order and token relationships</li>
+        </ul>
+    </div>
+</div>
+{% endautoescape %}
+"""
+
+@lru_cache(maxsize=None)
+def _jinja_env(use_bytecode_cache: bool) -> Environment:
+    """
+    Shared environment for the report templates
+    
+    With use_bytecode_cache the compiled templates are also kept on disk (under the
+    system temp dir), so new processes skip parsing and code generation.
+    """
+    return Environment(
+        loader=DictLoader({
+            'report.html': REPORT_TEMPLATE,
+            'algorithm_details.html': ALGORITHM_DETAILS_TEMPLATE
+        }),
+        bytecode_cache=FileSystemBytecodeCache() if use_bytecode_cache else None,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+@lru_cache(maxsize=None)
+def _get_template(name: str) -> Template:
+    """
+    Compile a report template once per process, on first use
+    
+    The on-disk bytecode cache is only an optimization: if its directory cannot be
+    created, is considered unsafe, or cannot be written, the template is compiled
+    in memory instead so reports never fail because of it.
+    """
+    try:
+        return _jinja_env(True).get_template(name)
+    except (OSError, RuntimeError):
+        return _jinja_env(False).get_template(name)
+
+# Column-name keyword patterns per category, checked in order; first match wins
+_COLUMN_CATEGORY_PATTERNS = [
+    (re.compile(r'name|embossed|primary|legal|dba'), 'Name Information'),
+    (re.compile(r'phone|email|fax'), 'Contact Information'),
+    (re.compile(r'address|location'), 'Address Information'),
+    (re.compile(r'gender|dob|birth|gov|id'), 'Personal Demographics'),
+    (re.compile(r'preference|language|member|since'), 'Preferences & Dates')
+]
+
+# Chart placeholder plus the single Plotly.newPlot call that draws the figure JSON into it
+PLOTLY_DIV_TEMPLATE = (
+    '<div id="{div_id}" class="plotly-graph-div"></div>'
+    '<script>(function () {{ var fig = {figure_json}; '
+    'Plotly.newPlot("{div_id}", fig.data, fig.layout, {{"responsive": true}}); }})();</script>'
+)
+
+def _build_chunk_xlsx(chunk_data: pd.DataFrame, file_num: int, records_range: str,
+                      preserved_count: int) -> tuple:
+    """
+    Build one part file of the multi-file Excel export
+    
+    Kept at module level and dependent only on its arguments so chunks can be
+    built independently of each other.
+    
+    Args:
+        chunk_data: Rows belonging to this part, already projected to the original
+            source columns (no 'matched' column)
+        file_num: 1-based part number
+        records_range: Human-readable range of records in this part
+        preserved_count: Number of original columns preserved, excluding table_name
+        
+    Returns:
+        Tuple of (filename, file_bytes)
+    """
+    workbook = Workbook(write_only=True)
+    
+    # Main data sheet with all original columns preserved
+    append_dataframe_rows(workbook.create_sheet('Demographic_Data'), chunk_data)
+    
+    # Summary sheet, appended row by row since it is only a handful of cells
+    summary_sheet = workbook.create_sheet('Summary')
+    summary_sheet.append(['Metric', 'Value'])
+    for row in [
+        ['Total Records in File', len(chunk_data)],
+        ['File Number', file_num],
+        ['Records Range', records_range],
+        ['Original Columns Preserved', preserved_count]
+    ]:
+        summary_sheet.append(row)
+    
+    output = io.BytesIO()
+    workbook.save(output)
+    filename = f"demographic_data_part_{file_num:02d}.xlsx"
+    return filename, output.getvalue()
+
+class ReportGenerator:
+    """
+    Generates comprehensive HTML analysis reports with charts and tables
+    """
+    
+    # Minified plotly.js bundle, read once per process and shared by offline generators
+    _plotlyjs: Optional[str] = None
+    
+    def __init__(self, offline_plotlyjs: bool = False):
+        """
+        Args:
+            offline_plotlyjs: Inline the plotly.js bundle shipped with the installed plotly
+                package instead of loading it from the CDN, so reports render without
+                network access
         """
+        self.offline_plotlyjs = offline_plotlyjs
     
     def generate_report(self, processed_data: pd.DataFrame, stats: Dict[str, Any], 
-                       fuzzy_algorithm: str = "ratio", fuzzy_threshold: int = 80) -> str:
+                       fuzzy_algorithm: str = "ratio", fuzzy_threshold: int = 80,
+                       table_summary: Optional[pd.DataFrame] = None) -> str:
         """
         Generate comprehensive HTML analysis report
         
@@ -324,6 +483,7 @@ class ReportGenerator:
             stats: Processing statistics
             fuzzy_algorithm: Algorithm used for fuzzy matching
             fuzzy_threshold: Threshold used for fuzzy matching
+            table_summary: Result of summarize_tables() for processed_data, if already computed
             
         Returns:
             HTML report as string
@@ -333,20 +493,25 @@ class ReportGenerator:
         unmatched_records = final_records - stats.get('matched_records', 0)
         match_rate = round((stats.get('matched_records', 0) / final_records * 100), 1) if final_records > 0 else 0
         
+        # Aggregate per-table counts once for the distribution chart and analysis table
+        if table_summary is None:
+            table_summary = self.summarize_tables(processed_data)
+        unique_tables = stats.get('unique_tables', len(table_summary) if table_summary is not None else 0)
+        
         # Determine detection method
         detection_method = "attr_description column analysis" if 'attr_description' in processed_data.columns else "Column name pattern matching"
         
         # Generate charts
         extraction_chart = self._create_extraction_chart(stats)
         matching_chart = self._create_matching_chart(stats, final_records)
-        table_distribution_chart = self._create_table_distribution_chart(processed_data)
+        table_distribution_chart = self._create_table_distribution_chart(table_summary)
         
         # Get demographic columns information
         demographic_columns = self._get_demographic_columns_info(processed_data, stats)
         col_categories = self._categorize_columns(demographic_columns)
         
         # Create table analysis table
-        table_analysis_table = self._create_table_analysis_table(processed_data)
+        table_analysis_table = self._create_table_analysis_table(table_summary)
         
         # Create algorithm details
         algorithm_details = self._create_algorithm_details(processed_data, fuzzy_algorithm, fuzzy_threshold)
@@ -355,15 +520,14 @@ class ReportGenerator:
         sample_data_table = self._create_sample_data_table(processed_data)
         
         # Render template
-        template = Template(self.report_template)
-        
-        report_html = template.render(
-            report_date=datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+        report_html = _get_template('report.html').render(
+            report_date=datetime.now().strftime(REPORT_DATE_FORMAT),
             stats=stats,
             fuzzy_algorithm=fuzzy_algorithm,
             fuzzy_threshold=fuzzy_threshold,
             detection_method=detection_method,
             match_rate=match_rate,
+            unique_tables=unique_tables,
             final_records=final_records,
             unmatched_records=unmatched_records,
             extraction_chart=extraction_chart,
@@ -373,156 +537,165 @@ class ReportGenerator:
             algorithm_details=algorithm_details,
             demographic_columns=demographic_columns,
             col_categories=col_categories,
-            sample_data_table=sample_data_table
+            sample_data_table=sample_data_table,
+            plotlyjs=self._get_plotlyjs() if self.offline_plotlyjs else None
         )
         
         return report_html
     
+    @classmethod
+    def _get_plotlyjs(cls) -> str:
+        """Return the bundled plotly.js source, loading it on first use"""
+        if cls._plotlyjs is None:
+            from plotly.offline import get_plotlyjs
+            cls._plotlyjs = get_plotlyjs()
+        return cls._plotlyjs
+    
     def _create_extraction_chart(self, stats: Dict[str, Any]) -> str:
         """Create extraction analysis chart"""
         labels = ['Demographic Rows', 'Non-Demographic Rows']
         values = [
-            stats.get('demographic_rows_extracted', 0),
-            stats.get('non_demographic_rows', 0)
+            int(stats.get('demographic_rows_extracted', 0)),
+            int(stats.get('non_demographic_rows', 0))
         ]
         colors = ['#2E86AB', '#A23B72']
         
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            marker_colors=colors,
-            hole=0.4,
-            textinfo='label+percent+value',
-            textfont_size=12
-        )])
-        
-        fig.update_layout(
-            title={
+        data = [{
+            'type': 'pie',
+            'labels': labels,
+            'values': values,
+            'marker': {'colors': colors},
+            'hole': 0.4,
+            'textinfo': 'label+percent+value',
+            'textfont': {'size': 12}
+        }]
+        
+        layout = {
+            'title': {
                 'text': 'Data Extraction Breakdown',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 18}
             },
-            height=400,
-            margin=dict(t=60, b=20, l=20, r=20)
-        )
+            'height': 400,
+            'margin': {'t': 60, 'b': 20, 'l': 20, 'r': 20}
+        }
         
-        return pyo.plot(fig, output_type='div', include_plotlyjs=False)
+        return self._figure_div('extraction-chart', data, layout)
     
     def _create_matching_chart(self, stats: Dict[str, Any], final_records: int) -> str:
         """Create matching performance chart"""
-        matched = stats.get('matched_records', 0)
+        matched = int(stats.get('matched_records', 0))
         unmatched = final_records - matched
         
-        fig = go.Figure(data=[
-            go.Bar(
-                x=['Matched Records', 'Unmatched Records'],
-                y=[matched, unmatched],
-                marker_color=['#F18F01', '#C73E1D'],
-                text=[f'{matched}', f'{unmatched}'],
-                textposition='auto',
-                textfont=dict(size=14, color='white')
-            )
-        ])
-        
-        fig.update_layout(
-            title={
+        data = [{
+            'type': 'bar',
+            'x': ['Matched Records', 'Unmatched Records'],
+            'y': [matched, unmatched],
+            'marker': {'color': ['#F18F01', '#C73E1D']},
+            'text': [f'{matched}', f'{unmatched}'],
+            'textposition': 'auto',
+            'textfont': {'size': 14, 'color': 'white'}
+        }]
+        
+        layout = {
+            'title': {
                 'text': 'Storage ID Matching Results',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 18}
             },
-            xaxis_title='Match Status',
-            yaxis_title='Number of Records',
-            height=400,
-            margin=dict(t=60, b=60, l=60, r=20)
-        )
+            'xaxis': {'title': {'text': 'Match Status'}},
+            'yaxis': {'title': {'text': 'Number of Records'}},
+            'height': 400,
+            'margin': {'t': 60, 'b': 60, 'l': 60, 'r': 20}
+        }
         
-        return pyo.plot(fig, output_type='div', include_plotlyjs=False)
+        return self._figure_div('matching-chart', data, layout)
     
-    def _create_table_distribution_chart(self, processed_data: pd.DataFrame) -> str:
-        """Create table distribution chart"""
-        if 'table_name' not in processed_data.columns:
+    def _create_table_distribution_chart(self, table_summary: Optional[pd.DataFrame]) -> str:
+        """Create table distribution chart from the per-table summary"""
+        if table_summary is None:
             return "<p>No table distribution data available</p>"
         
-        table_counts = processed_data['table_name'].value_counts().head(10)
-        
-        fig = go.Figure(data=[
-            go.Bar(
-                x=table_counts.index,
-                y=table_counts.values,
-                marker_color='#2E86AB',
-                text=table_counts.values,
-                textposition='auto',
-                textfont=dict(size=12, color='white')
-            )
-        ])
-        
-        fig.update_layout(
-            title={
+        # The summary is already fully sorted for the analysis table and Excel sheet, so
+        # the top 10 is a head() of it rather than a separate top-k selection
+        table_counts = table_summary['total'].head(10)
+        
+        data = [{
+            'type': 'bar',
+            'x': [str(name) for name in table_counts.index],
+            'y': table_counts.tolist(),
+            'marker': {'color': '#2E86AB'},
+            'text': table_counts.tolist(),
+            'textposition': 'auto',
+            'textfont': {'size': 12, 'color': 'white'}
+        }]
+        
+        layout = {
+            'title': {
                 'text': 'Top 10 Tables by Record Count',
                 'x': 0.5,
                 'xanchor': 'center',
                 'font': {'size': 18}
             },
-            xaxis_title='Table Name',
-            yaxis_title='Number of Records',
-            height=400,
-            margin=dict(t=60, b=100, l=60, r=20),
-            xaxis_tickangle=-45
-        )
+            'xaxis': {'title': {'text': 'Table Name'}, 'tickangle': -45},
+            'yaxis': {'title': {'text': 'Number of Records'}},
+            'height': 400,
+            'margin': {'t': 60, 'b': 100, 'l': 60, 'r': 20}
+        }
         
-        return pyo.plot(fig, output_type='div', include_plotlyjs=False)
+        return self._figure_div('table-distribution-chart', data, layout)
     
-    def _create_table_analysis_table(self, processed_data: pd.DataFrame) -> str:
-        """Create table analysis summary showing total fields and demographic data per table"""
+    def _figure_div(self, div_id: str, data: List[Dict[str, Any]], layout: Dict[str, Any]) -> str:
+        """
+        Embed a chart as a bare div and newPlot call
+        
+        The three report charts have fixed shapes, so their trace and layout dicts are
+        built by hand and serialized directly instead of going through plotly's figure
+        validation, without whitespace. '</' is escaped so table names cannot close the
+        script tag.
+        """
+        figure_json = json.dumps({'data': data, 'layout': layout}, separators=(',', ':')).replace('</', '<\\/')
+        return PLOTLY_DIV_TEMPLATE.format(div_id=div_id, figure_json=figure_json)
+    
+    def summarize_tables(self, processed_data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Aggregate per-table counts in a single groupby pass
+        
+        Returns a DataFrame indexed by table name, sorted by record count descending,
+        with 'total' (records per table) and, when attr_description exists, 'demo'
+        (non-null descriptions per table). Returns None without a table_name column.
+        Pass the result to generate_report and create_excel_export to share one pass
+        across both.
+        """
         if 'table_name' not in processed_data.columns:
-            return "<p>Table analysis not available - no table_name column found in data.</p>"
+            return None
+        
+        grouped = processed_data.groupby('table_name', sort=False, observed=True)
+        table_summary = pd.DataFrame({'total': grouped.size()})
+        if 'attr_description' in processed_data.columns:
+            table_summary['demo'] = grouped['attr_description'].count()
         
-        # Group by table_name and count records
-        table_stats = processed_data.groupby('table_name').agg({
-            'attr_name': 'count',  # Total fields in each table
-            'attr_description': lambda x: x.count()  # Non-null demographic descriptions
-        }).reset_index()
+        return table_summary.sort_values('total', ascending=False, kind='stable')
+    
+    def _create_table_analysis_table(self, table_summary: Optional[pd.DataFrame]) -> str:
+        """Create table analysis summary showing total fields and demographic data per table"""
+        if table_summary is None:
+            return "<p>Table analysis not available - no table_name column found in data.</p>"
+        if 'demo' not in table_summary.columns:
+            return "<p>Table analysis not available - no attr_description column found in data.</p>"
         
+        table_stats = table_summary.reset_index()
         table_stats.columns = ['Table Name', 'Total Fields', 'Demographic Fields']
         
         # Calculate percentage of demographic fields per table
         table_stats['Demographic %'] = ((table_stats['Demographic Fields'] / table_stats['Total Fields']) * 100).round(1)
         
-        # Sort by total fields descending
-        table_stats = table_stats.sort_values('Total Fields', ascending=False)
-        
-        # Create HTML table
-        html = """
-        <table>
-            <thead>
-                <tr>
-                    <th>Table Name</th>
-                    <th>Total Fields</th>
-                    <th>Demographic Fields</th>
-                    <th>Demographic %</th>
-                </tr>
-            </thead>
-            <tbody>
-        """
-        
-        for _, row in table_stats.iterrows():
-            html += f"""
-                <tr>
-                    <td>{row['Table Name']}</td>
-                    <td>{row['Total Fields']}</td>
-                    <td>{row['Demographic Fields']}</td>
-                    <td>{row['Demographic %']}%</td>
-                </tr>
-            """
-        
-        html += """
-            </tbody>
-        </table>
-        """
+        # Render with pandas' HTML formatter instead of concatenating rows in Python
+        table_stats['Demographic %'] = table_stats['Demographic %'].map('{:.1f}%'.format)
         
-        return html
+        return table_stats.to_html(classes='table', index=False, border=0, escape=True)
     
     def _create_algorithm_details(self, processed_data: pd.DataFrame, fuzzy_algorithm: str, fuzzy_threshold: int) -> str:
         """Create detailed algorithm explanation with examples"""
@@ -538,7 +711,7 @@ class ReportGenerator:
         algorithm_desc = algorithm_descriptions.get(fuzzy_algorithm, 'Advanced string similarity matching')
         
         # Create examples from actual data if available
-        examples_html = ""
+        examples = None
         if 'attr_description' in processed_data.columns:
             # Get some sample descriptions for examples
             sample_descriptions = processed_data['attr_description'].dropna().head(3).tolist()
@@ -546,76 +719,33 @@ class ReportGenerator:
             # Demographic keywords for examples
             demo_keywords = ['age', 'gender', 'race', 'ethnicity', 'sex', 'birth', 'demographic']
             
-            examples_html = """
-            <h4>Matching Examples from Your Data:</h4>
-            <div class="examples-container">
-            """
+            # Pick the scorer once rather than per keyword
+            scorer = DataProcessor.FUZZY_SCORERS.get(fuzzy_algorithm, fuzz.token_set_ratio)
             
-            for i, desc in enumerate(sample_descriptions[:2]):
+            examples = []
+            for desc in sample_descriptions[:2]:
                 if len(str(desc)) > 10:  # Ensure it's a meaningful description
-                    # Calculate similarity with a demographic keyword
-                    from fuzzywuzzy import fuzz
-                    best_match = ""
-                    best_score = 0
+                    # Score the lowercased description against every keyword in one call
+                    best_match, best_score = process.extractOne(
+                        str(desc).lower(), demo_keywords, processor=None, scorer=scorer
+                    )
+                    # extractOne still returns the first keyword when nothing scores; show no match
+                    if best_score == 0:
+                        best_match = ""
                     
-                    for keyword in demo_keywords:
-                        if fuzzy_algorithm == 'ratio':
-                            score = fuzz.ratio(str(desc).lower(), keyword)
-                        elif fuzzy_algorithm == 'partial_ratio':
-                            score = fuzz.partial_ratio(str(desc).lower(), keyword)
-                        elif fuzzy_algorithm == 'token_sort_ratio':
-                            score = fuzz.token_sort_ratio(str(desc).lower(), keyword)
-                        else:  # token_set_ratio
-                            score = fuzz.token_set_ratio(str(desc).lower(), keyword)
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_match = keyword
-                    
-                    match_status = "✓ MATCH" if best_score >= fuzzy_threshold else "✗ NO MATCH"
-                    color = "#28a745" if best_score >= fuzzy_threshold else "#dc3545"
-                    
-                    examples_html += f"""
-                    <div class="example-item" style="border-left: 4px solid {color}; padding: 10px; margin: 10px 0; background: #f8f9fa;">
-                        <strong>Text:</strong> "{str(desc)[:80]}..."<br>
-                        <strong>Best Keyword Match:</strong> "{best_match}"<br>
-                        <strong>Similarity Score:</strong> {best_score}% <span style="color: {color}; font-weight: bold;">({match_status})</span>
-                    </div>
-                    """
-            
-            examples_html += "</div>"
-        
-        html = f"""
-        <div class="algorithm-info" style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
-            <h3>Fuzzy Matching Algorithm: {fuzzy_algorithm.replace('_', ' ').title()}</h3>
-            
-            <div class="algorithm-description">
-                <h4>How It Works:</h4>
-                <p><strong>Algorithm:</strong> {algorithm_desc}</p>
-                <p><strong>Threshold:</strong> {fuzzy_threshold}% (minimum similarity required for a match)</p>
-                <p><strong>Process:</strong> The system analyzes the 'attr_description' column content and compares it against demographic keywords using fuzzy string matching. Any description with a similarity score above {fuzzy_threshold}% is classified as demographic data.</p>
-            </div>
-            
-            <div class="keywords-list">
-                <h4>Demographic Keywords Used:</h4>
-                <p style="font-style: italic;">age, gender, race, ethnicity, sex, birth, demographic, population, ancestry, nationality, heritage, origin, background</p>
-            </div>
-            
-            {examples_html}
-            
-            <div class="algorithm-benefits">
-                <h4>Why Fuzzy Matching?</h4>
-                <ul>
-                    <li><strong>Handles Typos:</strong> Finds matches even with spelling errors</li>
-                    <li><strong>Flexible Matching:</strong> Works with partial words and different formats</li>
-                    <li><strong>Configurable Precision:</strong> Adjustable threshold allows fine-tuning sensitivity</li>
-                    <li><strong>Context Aware:</strong> Considers word order and token relationships</li>
-                </ul>
-            </div>
-        </div>
-        """
-        
-        return html
+                    examples.append({
+                        'text': str(desc),
+                        'keyword': best_match,
+                        'score': best_score,
+                        'match': best_score >= fuzzy_threshold
+                    })
+        
+        return _get_template('algorithm_details.html').render(
+            algorithm_title=fuzzy_algorithm.replace('_', ' ').title(),
+            algorithm_desc=algorithm_desc,
+            fuzzy_threshold=fuzzy_threshold,
+            examples=examples
+        )
     
     def _get_demographic_columns_info(self, processed_data: pd.DataFrame, stats: Dict[str, Any]) -> List[tuple]:
         """Get demographic columns information"""
@@ -624,94 +754,114 @@ class ReportGenerator:
             return [(i+1, col) for i, col in enumerate(demo_cols)]
         
         # If no specific demographic columns, show some key columns
-        key_cols = [col for col in processed_data.columns 
-                   if col not in ['storage_id', 'table_name', 'matched']][:10]
+        columns = processed_data.columns
+        key_cols = columns[~columns.isin(['storage_id', 'table_name', 'matched'])][:10].tolist()
         return [(i+1, col) for i, col in enumerate(key_cols)]
     
     def _categorize_columns(self, demographic_columns: List[tuple]) -> Dict[str, str]:
         """Categorize demographic columns"""
-        categories = {}
+        return dict(self._categorize_column_names(tuple(col_name for _, col_name in demographic_columns)))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _categorize_column_names(col_names: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+        """Categorize column names, memoized per schema since categories depend only on the names"""
+        categorized = []
         
-        for _, col_name in demographic_columns:
+        for col_name in col_names:
             col_lower = col_name.lower()
-            if any(name_key in col_lower for name_key in ['name', 'embossed', 'primary', 'legal', 'dba']):
-                categories[col_name] = 'Name Information'
-            elif any(contact_key in col_lower for contact_key in ['phone', 'email', 'fax']):
-                categories[col_name] = 'Contact Information'
-            elif any(addr_key in col_lower for addr_key in ['address', 'location']):
-                categories[col_name] = 'Address Information'
-            elif any(id_key in col_lower for id_key in ['gender', 'dob', 'birth', 'gov', 'id']):
-                categories[col_name] = 'Personal Demographics'
-            elif any(pref_key in col_lower for pref_key in ['preference', 'language', 'member', 'since']):
-                categories[col_name] = 'Preferences & Dates'
-            else:
-                categories[col_name] = 'General Demographic'
-        
-        return categories
+            category = 'General Demographic'
+            for pattern, label in _COLUMN_CATEGORY_PATTERNS:
+                if pattern.search(col_lower):
+                    category = label
+                    break
+            categorized.append((col_name, category))
+        
+        return tuple(categorized)
     
     def _create_sample_data_table(self, processed_data: pd.DataFrame, max_rows: int = 10) -> str:
         """Create HTML table for sample data"""
-        sample_df = processed_data.head(max_rows)
-        
-        # Limit columns to prevent wide tables
-        display_cols = list(sample_df.columns)[:8]
-        sample_df = sample_df[display_cols]
-        
-        html_table = sample_df.to_html(
-            classes='table',
-            table_id='sample-data',
-            escape=False,
-            index=False,
-            border=0
-        )
+        # Take the leading rows and columns (limited to prevent wide tables) in one positional slice
+        sample_df = processed_data.iloc[:max_rows, :8]
+        
+        # At most 10x8 cells, so build the markup directly instead of going through to_html
+        parts = ['<table class="table" id="sample-data"><thead><tr>']
+        parts.extend(f'<th>{html.escape(str(col))}</th>' for col in sample_df.columns)
+        parts.append('</tr></thead><tbody>')
+        
+        # Format each column with pandas' own array formatter, as to_html does, so floats
+        # share a column-wide precision and None/NaN/NaT/<NA> keep their usual text
+        formatted_cols = [
+            [value.strip() for value in format_array(sample_df.iloc[:, i]._values, None, leading_space=False)]
+            for i in range(sample_df.shape[1])
+        ]
         
-        return html_table
+        for row in zip(*formatted_cols):
+            parts.append('<tr>')
+            parts.extend(f'<td>{html.escape(value)}</td>' for value in row)
+            parts.append('</tr>')
+        
+        parts.append('</tbody></table>')
+        return ''.join(parts)
     
-    def create_excel_export(self, processed_data: pd.DataFrame, stats: Dict[str, Any]) -> bytes:
+    def create_excel_export(self, processed_data: pd.DataFrame, stats: Dict[str, Any],
+                            table_summary: Optional[pd.DataFrame] = None) -> bytes:
         """
         Create Excel file with multiple sheets for export
         
         Args:
             processed_data: The processed demographic data
             stats: Processing statistics
+            table_summary: Result of summarize_tables() for processed_data, if already computed
             
         Returns:
             Excel file as bytes
         """
+        if table_summary is None:
+            table_summary = self.summarize_tables(processed_data)
         output = io.BytesIO()
         
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Include all original columns from source file (table_name, attr_name, business_name, attr_description, etc.)
-            original_data_only = processed_data[[col for col in processed_data.columns if col != 'matched']]
-            
-            # Main processed data with all original columns preserved
-            original_data_only.to_excel(writer, sheet_name='Processed_Data', index=False)
-            
-            # Statistics summary
-            stats_df = pd.DataFrame([
-                ['Total Input Rows', stats.get('original_columns_total', 0)],
-                ['Demographic Rows Extracted', stats.get('demographic_rows_extracted', 0)],
-                ['Non-Demographic Rows', stats.get('non_demographic_rows', 0)],
-                ['Final Processed Records', len(processed_data)],
-                ['Successfully Matched', stats.get('matched_records', 0)],
-                ['Unmatched Records', len(processed_data) - stats.get('matched_records', 0)],
-                ['Extraction Percentage', f"{stats.get('extraction_percentage', 0)}%"],
-                ['Unique Tables', stats.get('unique_tables', 0)]
-            ], columns=['Metric', 'Value'])
-            
-            stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-            
-            # Table distribution
-            if 'table_name' in processed_data.columns:
-                table_dist = processed_data['table_name'].value_counts().reset_index()
-                table_dist.columns = ['Table Name', 'Record Count']
-                table_dist.to_excel(writer, sheet_name='Table_Distribution', index=False)
-            
-            # Demographic columns info
-            demo_cols = stats.get('demographic_column_names', [])
-            if demo_cols:
-                demo_df = pd.DataFrame(demo_cols, columns=['Demographic Column'])
-                demo_df.to_excel(writer, sheet_name='Demographic_Columns', index=False)
+        # Write-only workbooks stream rows to the file instead of keeping every cell in memory
+        workbook = Workbook(write_only=True)
+        
+        # Include all original columns from source file (table_name, attr_name, business_name, attr_description, etc.)
+        original_data_only = processed_data.drop(columns=['matched'], errors='ignore')
+        
+        # Main processed data with all original columns preserved
+        append_dataframe_rows(workbook.create_sheet('Processed_Data'), original_data_only)
+        
+        # Statistics summary, appended row by row since it is only a handful of cells
+        stats_sheet = workbook.create_sheet('Statistics')
+        stats_sheet.append(['Metric', 'Value'])
+        for row in [
+            ['Total Input Rows', stats.get('original_columns_total', 0)],
+            ['Demographic Rows Extracted', stats.get('demographic_rows_extracted', 0)],
+            ['Non-Demographic Rows', stats.get('non_demographic_rows', 0)],
+            ['Final Processed Records', len(processed_data)],
+            ['Successfully Matched', stats.get('matched_records', 0)],
+            ['Unmatched Records', len(processed_data) - stats.get('matched_records', 0)],
+            ['Extraction Percentage', f"{stats.get('extraction_percentage', 0)}%"],
+            ['Unique Tables', stats.get('unique_tables', len(table_summary) if table_summary is not None else 0)]
+        ]:
+            stats_sheet.append(row)
+        
+        # Table distribution
+        if table_summary is not None:
+            # Stream the per-table counts directly rather than materializing a frame for them
+            dist_sheet = workbook.create_sheet('Table_Distribution')
+            dist_sheet.append(['Table Name', 'Record Count'])
+            for table_name, record_count in table_summary['total'].items():
+                dist_sheet.append([table_name, int(record_count)])
+        
+        # Demographic columns info
+        demo_cols = stats.get('demographic_column_names', [])
+        if demo_cols:
+            demo_sheet = workbook.create_sheet('Demographic_Columns')
+            demo_sheet.append(['Demographic Column'])
+            for col_name in demo_cols:
+                demo_sheet.append([col_name])
+        
+        workbook.save(output)
         
         return output.getvalue()
     
@@ -726,69 +876,69 @@ class ReportGenerator:
             CSV file as bytes
         """
         # Include all original columns from source file (table_name, attr_name, business_name, attr_description, etc.)
-        original_data_only = processed_data[[col for col in processed_data.columns if col != 'matched']]
+        original_data_only = processed_data.drop(columns=['matched'], errors='ignore')
         
-        output = io.StringIO()
-        original_data_only.to_csv(output, index=False)
-        return output.getvalue().encode('utf-8')
+        # Let pandas encode straight into a bytes buffer rather than building a str and encoding it
+        output = io.BytesIO()
+        original_data_only.to_csv(output, index=False, encoding='utf-8')
+        return output.getvalue()
     
-    def create_multiple_excel_files(self, processed_data: pd.DataFrame, records_per_file: int = None) -> List[tuple]:
+    def create_multiple_excel_files(self, processed_data: pd.DataFrame, records_per_file: int = None,
+                                    num_workers: Optional[int] = 1) -> List[tuple]:
         """
         Create multiple Excel files with demographic data split across them
         
         Args:
             processed_data: The processed demographic data
             records_per_file: Number of records per file (if None, splits into 20 files)
+            num_workers: Worker processes used to build the files in parallel (None uses
+                every CPU, capped at the number of files); 1 or less builds them serially
+                in this process, which is also the fallback if the pool fails
             
         Returns:
             List of tuples containing (filename, file_bytes)
         """
-        if records_per_file is None:
-            # Split into 20 files
-            total_records = len(processed_data)
-            records_per_file = max(1, total_records // 20)
-            if total_records % 20 > 0:
-                records_per_file += 1
-        
-        files = []
         total_records = len(processed_data)
         
-        for i in range(0, total_records, records_per_file):
-            file_num = (i // records_per_file) + 1
-            chunk_data = processed_data.iloc[i:i + records_per_file].copy()
-            
-            if chunk_data.empty:
-                continue
-            
-            # Create Excel file for this chunk
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                # Include all original columns from source file (table_name, attr_name, business_name, attr_description, etc.)
-                original_data_only = chunk_data[[col for col in chunk_data.columns if col != 'matched']]
-                
-                # Main data sheet with all original columns preserved
-                original_data_only.to_excel(writer, sheet_name='Demographic_Data', index=False)
-                
-                # Summary sheet
-                summary_data = {
-                    'Metric': [
-                        'Total Records in File',
-                        'File Number',
-                        'Records Range',
-                        'Original Columns Preserved'
-                    ],
-                    'Value': [
-                        len(chunk_data),
-                        file_num,
-                        f"{i+1} to {min(i + records_per_file, total_records)}",
-                        len([col for col in chunk_data.columns if col not in ['table_name', 'matched']])
-                    ]
-                }
-                
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            filename = f"demographic_data_part_{file_num:02d}.xlsx"
-            files.append((filename, output.getvalue()))
+        if records_per_file is None:
+            # Split into 20 near-equal parts, sized like numpy.array_split, so any input
+            # with at least 20 records yields exactly 20 files
+            base_size, remainder = divmod(total_records, 20)
+            part_sizes = [base_size + 1 if part < remainder else base_size for part in range(20)]
+        else:
+            part_sizes = [records_per_file] * -(-total_records // records_per_file)
+        
+        # Compute every part's row boundaries up front
+        bounds = []
+        start = 0
+        for size in part_sizes:
+            if size:
+                bounds.append((start, min(start + size, total_records)))
+                start += size
         
-        return files
\ No newline at end of file
+        # Include all original columns from source file (table_name, attr_name, business_name, attr_description, etc.)
+        # The column set is the same for every part, so project and count it once
+        columns = processed_data.columns
+        keep_cols = columns[columns != 'matched']
+        preserved_count = int((~columns.isin(['table_name', 'matched'])).sum())
+        
+        # Slice rows first, then project columns; bounds never yields an empty part
+        def chunks():
+            return (processed_data.iloc[i:end][keep_cols] for i, end in bounds)
+        file_nums = range(1, len(bounds) + 1)
+        records_ranges = [f"{i+1} to {end}" for i, end in bounds]
+        preserved_counts = [preserved_count] * len(bounds)
+        
+        if num_workers is None or num_workers > 1:
+            # Parts are independent, so build them in worker processes; only each sliced
+            # part is pickled to a worker, never the full frame. Never start more workers
+            # than there are parts.
+            max_workers = min(num_workers or os.cpu_count() or 1, len(bounds))
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    return list(executor.map(_build_chunk_xlsx, chunks(), file_nums, records_ranges, preserved_counts))
+            except (BrokenProcessPool, OSError):
+                # Workers could not be started or died; build the parts serially instead
+                pass
+        
+        return list(map(_build_chunk_xlsx, chunks(), file_nums, records_ranges, preserved_counts))
\ No newline at end of file
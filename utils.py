@@ -1,8 +1,19 @@
 import pandas as pd
 import streamlit as st
+from openpyxl import Workbook
+from excel_utils import append_dataframe_rows
 from typing import Any, Optional
 import base64
 import io
+import re
+import zipfile
+
+# Patterns used by safe_column_name, compiled once at import
+_SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Local file header signature that every xlsx (a ZIP package) starts with
+_XLSX_SIGNATURE = b'PK\x03\x04'
 
 def validate_file(file) -> bool:
     """
@@ -27,7 +38,8 @@ def validate_file(file) -> bool:
         
         if file.name.lower().endswith('.csv'):
             pd.read_csv(file, nrows=1)  # Read just one row to test
-        else:
+        elif not _looks_like_xlsx(file):
+            file.seek(0)
             pd.read_excel(file, nrows=1)  # Read just one row to test
             
         file.seek(0)  # Reset file pointer again
@@ -35,6 +47,24 @@ def validate_file(file) -> bool:
     except Exception:
         return False
 
+def _looks_like_xlsx(file) -> bool:
+    """
+    Check for an xlsx package by its ZIP signature and workbook part, without parsing it
+    
+    Only reads the ZIP central directory, so it is far cheaper than opening the workbook.
+    A False result is not a rejection; callers fall back to a real read.
+    """
+    file.seek(0)
+    if file.read(len(_XLSX_SIGNATURE)) != _XLSX_SIGNATURE:
+        return False
+    
+    file.seek(0)
+    try:
+        with zipfile.ZipFile(file) as archive:
+            return 'xl/workbook.xml' in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
 def validate_excel_file(file) -> bool:
     """
     Backward compatibility function - now validates both Excel and CSV
@@ -54,12 +84,14 @@ def create_download_link(df: pd.DataFrame, filename: str, link_text: str) -> str
         HTML string for download link
     """
     try:
+        workbook = Workbook(write_only=True)
+        append_dataframe_rows(workbook.create_sheet('Data'), df)
+        
         output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Data')
+        workbook.save(output)
         
-        excel_data = output.getvalue()
-        b64 = base64.b64encode(excel_data).decode()
+        # Encode straight from the buffer instead of copying it out to bytes first
+        b64 = base64.b64encode(output.getbuffer()).decode()
         
         href = f'<a href="data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{b64}" download="{filename}">{link_text}</a>'
         return href
@@ -78,6 +110,9 @@ def display_dataframe_info(df: pd.DataFrame, title: str) -> None:
     """
     st.subheader(title)
     
+    # One null scan shared by the metric and the per-column breakdown
+    null_per_col = df.isnull().sum()
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -87,7 +122,7 @@ def display_dataframe_info(df: pd.DataFrame, title: str) -> None:
         st.metric("Columns", len(df.columns))
     
     with col3:
-        null_count = df.isnull().sum().sum()
+        null_count = null_per_col.sum()
         st.metric("Null Values", null_count)
     
     # Show column information
@@ -95,8 +130,8 @@ def display_dataframe_info(df: pd.DataFrame, title: str) -> None:
         col_info = pd.DataFrame({
             'Column': df.columns,
             'Data Type': df.dtypes.astype(str),
-            'Null Count': df.isnull().sum().values,
-            'Null %': (df.isnull().sum() / len(df) * 100).round(2).values
+            'Null Count': null_per_col.values,
+            'Null %': (null_per_col / len(df) * 100).round(2).values
         })
         st.dataframe(col_info, use_container_width=True)
 
@@ -129,10 +164,9 @@ def safe_column_name(name: str) -> str:
     Returns:
         Sanitized column name
     """
-    import re
     # Replace spaces and special characters with underscores
-    safe_name = re.sub(r'[^\w\s]', '', name)
-    safe_name = re.sub(r'\s+', '_', safe_name)
+    safe_name = _SPECIAL_CHARS_PATTERN.sub('', name)
+    safe_name = _WHITESPACE_PATTERN.sub('_', safe_name)
     return safe_name.lower()
 
 def get_sample_data_info() -> dict:
@@ -170,12 +204,13 @@ def validate_storage_ids(table_df: pd.DataFrame, columns_df: pd.DataFrame,
         Dictionary with validation results
     """
     try:
-        table_ids = set(table_df[table_id_col].dropna())
-        column_ids = set(columns_df[columns_id_col].dropna())
+        # Unique IDs as Index objects so the set arithmetic runs on pandas' hash tables
+        table_ids = pd.Index(table_df[table_id_col].dropna().unique())
+        column_ids = pd.Index(columns_df[columns_id_col].dropna().unique())
         
         common_ids = table_ids.intersection(column_ids)
-        table_only = table_ids - column_ids
-        columns_only = column_ids - table_ids
+        table_only = table_ids.difference(column_ids)
+        columns_only = column_ids.difference(table_ids)
         
         return {
             'valid': True,